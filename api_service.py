@@ -1,8 +1,10 @@
 # api_service.py
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 import time
-from threading import Thread, Event
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread, Event, Timer
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('API_Service')
@@ -16,52 +18,119 @@ class BrightnessAPI:
         self.stop_event = Event()
         self.update_thread = None
         
+        # Circuit breaker: after repeated failures, skip requests until the back-off expires
+        self.consecutive_failures = 0
+        self.circuit_open_until = 0.0
+        # Newest state requested via notify(); re-sent once the circuit closes if it failed
+        self.pending_state = None
+        self.retry_timer = None
+        
+        # Reuse one keep-alive connection to the API instead of reconnecting per update
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # Single worker so updates are sent in order without blocking the caller
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='BrightnessAPI')
+        
     def update_brightness(self, is_on):
         """Update brightness state via API"""
+        if time.monotonic() < self.circuit_open_until:
+            logger.warning(f"Skipping brightness update to {is_on}: API backing off after {self.consecutive_failures} failures")
+            return False
+        
         try:
             payload = {"brightness": is_on}
-            response = requests.post(self.full_url, json=payload, timeout=5)
+            # (connect, read) timeouts keep a dead endpoint from stalling the update worker
+            response = self.session.post(self.full_url, json=payload, timeout=(1.0, 2.0))
             
             if response.status_code == 200:
                 logger.info(f"Successfully updated brightness to {is_on}")
                 self.last_reported_state = is_on
+                self.consecutive_failures = 0
                 return True
             else:
                 logger.error(f"API error: {response.status_code} - {response.text}")
+                self._record_failure()
                 return False
         except requests.RequestException as e:
             logger.error(f"Failed to update brightness: {e}")
+            self._record_failure()
             return False
     
-    def start_periodic_updates(self, get_current_state_callback, interval=10):
-        """Start a thread that periodically updates the API based on the current state"""
+    def _record_failure(self):
+        """Open the circuit for an exponentially growing window, capped at 60s"""
+        self.consecutive_failures += 1
+        self.circuit_open_until = time.monotonic() + min(60, 2 ** self.consecutive_failures)
+    
+    def notify(self, is_on):
+        """Report a brightness state change in the background, skipping unchanged states"""
+        self.pending_state = is_on
+        try:
+            self.executor.submit(self._update_if_changed, is_on)
+        except RuntimeError:
+            # close() has already shut the worker down
+            logger.debug(f"Ignoring brightness update to {is_on} after close")
+    
+    def _update_if_changed(self, is_on):
+        """Update the API only if the state differs from the last reported one"""
+        if is_on != self.last_reported_state and not self.update_brightness(is_on):
+            self._schedule_retry()
+    
+    def _schedule_retry(self):
+        """Re-submit the pending state as soon as the circuit breaker closes"""
+        if self.retry_timer and self.retry_timer.is_alive():
+            return
+        delay = max(0.0, self.circuit_open_until - time.monotonic())
+        self.retry_timer = Timer(delay, self._retry_pending)
+        self.retry_timer.daemon = True
+        self.retry_timer.start()
+    
+    def _retry_pending(self):
+        """Timer callback: send the newest pending state through the worker"""
+        try:
+            self.executor.submit(self._update_if_changed, self.pending_state)
+        except RuntimeError:
+            # close() has already shut the worker down
+            pass
+    
+    def start_periodic_updates(self, get_current_state_callback, interval=300):
+        """Start a heartbeat thread that periodically re-reports the current state"""
         self.stop_event.clear()
         self.update_thread = Thread(target=self._update_loop, args=(get_current_state_callback, interval))
         self.update_thread.daemon = True
         self.update_thread.start()
-        logger.info(f"Started periodic API updates (every {interval}s)")
+        logger.info(f"Started periodic API heartbeat (every {interval}s)")
     
     def stop_periodic_updates(self):
-        """Stop the periodic update thread"""
+        """Stop the heartbeat thread"""
         self.stop_event.set()
         if self.update_thread and self.update_thread.is_alive():
             self.update_thread.join(timeout=2)
         logger.info("Stopped periodic API updates")
     
+    def close(self):
+        """Drop any queued updates and release the worker thread and connection pool"""
+        if self.retry_timer:
+            self.retry_timer.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        # shutdown() has no timeout, so wait for an in-flight request from a helper thread
+        waiter = Thread(target=self.executor.shutdown)
+        waiter.daemon = True
+        waiter.start()
+        waiter.join(timeout=3)
+        if waiter.is_alive():
+            logger.warning("API worker still busy; leaving its connection open until exit")
+            return
+        self.session.close()
+    
     def _update_loop(self, get_current_state_callback, interval):
-        """Loop that periodically checks the current state and updates the API if needed"""
-        while not self.stop_event.is_set():
+        """Heartbeat loop; state changes are pushed through notify() as they happen"""
+        # Sleep until the next heartbeat, waking immediately if stop is requested
+        while not self.stop_event.wait(interval):
             try:
-                current_state = get_current_state_callback()
-                
-                # Only update if state has changed or never reported
-                if self.last_reported_state is None or current_state != self.last_reported_state:
-                    self.update_brightness(current_state)
+                # Re-report even if unchanged so the backend sees the device is alive
+                self.executor.submit(self.update_brightness, get_current_state_callback())
             except Exception as e:
                 logger.error(f"Error in update loop: {e}")
-            
-            # Sleep in small increments to respond to stop event more quickly
-            for _ in range(interval * 10):
-                if self.stop_event.is_set():
-                    break
-                time.sleep(0.1)
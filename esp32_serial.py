@@ -1,13 +1,25 @@
 # esp32_serial.py
 import serial
-import json
+import orjson
 import logging
+import selectors
+import struct
 from threading import Thread, Event
 import time
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('ESP32_Serial')
 
+# Plain-text status lines printed by the ESP32 firmware
+MOTION_DETECTED_MSG = b"Motion detected!"
+MOTION_STOPPED_MSG = b"Motion stopped"
+
+# Binary accelerometer frame: sync byte, little-endian float32 x, y, z, newline.
+# Only a complete line of exactly this size is decoded; anything else is treated as text.
+ACCEL_FRAME_SYNC = b'\xaa'
+ACCEL_FRAME_SIZE = 14
+_UNPACK_ACCEL = struct.Struct('<3f').unpack_from
+
 class ESP32Monitor:
     def __init__(self, port='/dev/ttyUSB0', baudrate=115200):
         self.port = port
@@ -17,6 +29,7 @@ class ESP32Monitor:
         self.stop_event = Event()
         self.motion_detected = False
         self.motion_callback = None
+        self.accel_callback = None
         self.monitor_thread = None
         
     def connect(self):
@@ -25,8 +38,9 @@ class ESP32Monitor:
             self.serial_conn = serial.Serial(
                 port=self.port,
                 baudrate=self.baudrate,
-                timeout=1
+                timeout=0.1  # Short timeout so the monitor loop can check stop_event promptly
             )
+            self._enable_low_latency()
             self.is_connected = True
             logger.info(f"Connected to ESP32 on {self.port}")
             return True
@@ -35,6 +49,14 @@ class ESP32Monitor:
             self.is_connected = False
             return False
     
+    def _enable_low_latency(self):
+        """Ask the USB-serial driver to deliver bytes immediately (Linux only)"""
+        try:
+            self.serial_conn.set_low_latency_mode(True)
+        except (AttributeError, NotImplementedError, IOError, ValueError) as e:
+            # Not supported on this platform or by this driver; readline still works
+            logger.debug(f"Low latency mode unavailable: {e}")
+    
     def disconnect(self):
         """Close the serial connection"""
         self.stop_event.set()
@@ -50,41 +72,62 @@ class ESP32Monitor:
         """Register callback function to be called when motion state changes"""
         self.motion_callback = callback
     
+    def register_accelerometer_callback(self, callback):
+        """Register callback function to be called with (x, y, z) for each accelerometer sample"""
+        self.accel_callback = callback
+    
+    def _parse_binary(self, frame):
+        """Decode a complete binary accelerometer frame from ESP32"""
+        sample = _UNPACK_ACCEL(frame, 1)
+        if self.accel_callback:
+            self.accel_callback(*sample)
+        return sample
+    
+    def _is_accel_frame(self, line):
+        """True if an unstripped line is a complete binary accelerometer frame"""
+        return len(line) == ACCEL_FRAME_SIZE and line[:1] == ACCEL_FRAME_SYNC and line[-1:] == b'\n'
+    
     def _process_data(self, data):
-        """Process incoming data from ESP32"""
-        try:
-            # Try to parse as JSON first
-            parsed_data = json.loads(data)
-            
-            # Check if this is a motion detection message
-            if 'motion' in parsed_data:
-                new_motion_state = parsed_data['motion']
+        """Process a raw line (bytes) received from ESP32"""
+        if self._is_accel_frame(data):
+            return self._parse_binary(data)
+        
+        # Only lines that look like a JSON object go through the parser
+        if data[:1] == b'{':
+            try:
+                parsed_data = orjson.loads(data)
                 
-                # Only trigger callback if state has changed
-                if self.motion_detected != new_motion_state:
-                    self.motion_detected = new_motion_state
-                    logger.info(f"Motion state changed: {self.motion_detected}")
+                # Check if this is a motion detection message
+                if 'motion' in parsed_data:
+                    new_motion_state = parsed_data['motion']
                     
-                    if self.motion_callback:
-                        self.motion_callback(self.motion_detected)
-            
-            return parsed_data
-        except json.JSONDecodeError:
-            # Not JSON, look for specific text indicators
-            if "Motion detected!" in data:
-                if not self.motion_detected:
-                    self.motion_detected = True
-                    logger.info("Motion detected")
-                    if self.motion_callback:
-                        self.motion_callback(True)
-            elif "Motion stopped" in data:
-                if self.motion_detected:
-                    self.motion_detected = False
-                    logger.info("Motion stopped")
-                    if self.motion_callback:
-                        self.motion_callback(False)
-            
-            return data
+                    # Only trigger callback if state has changed
+                    if self.motion_detected != new_motion_state:
+                        self.motion_detected = new_motion_state
+                        logger.info(f"Motion state changed: {self.motion_detected}")
+                        
+                        if self.motion_callback:
+                            self.motion_callback(self.motion_detected)
+                
+                return parsed_data
+            except orjson.JSONDecodeError:
+                pass
+        
+        # Not JSON, look for specific text indicators
+        if MOTION_DETECTED_MSG in data:
+            if not self.motion_detected:
+                self.motion_detected = True
+                logger.info("Motion detected")
+                if self.motion_callback:
+                    self.motion_callback(True)
+        elif MOTION_STOPPED_MSG in data:
+            if self.motion_detected:
+                self.motion_detected = False
+                logger.info("Motion stopped")
+                if self.motion_callback:
+                    self.motion_callback(False)
+        
+        return data
     
     def start_monitoring(self):
         """Start monitoring ESP32 data in a separate thread"""
@@ -100,6 +143,18 @@ class ESP32Monitor:
         logger.info("ESP32 monitoring started")
         return True
     
+    def _make_selector(self):
+        """Return a selector watching the serial port for input, or None if it has no pollable fd"""
+        selector = selectors.DefaultSelector()
+        try:
+            selector.register(self.serial_conn.fileno(), selectors.EVENT_READ)
+            return selector
+        except (AttributeError, OSError, ValueError) as e:
+            # e.g. Windows COM ports; readline still blocks with the read timeout
+            logger.debug(f"Serial port cannot be polled, using blocking reads: {e}")
+            selector.close()
+            return None
+    
     def _monitor_loop(self):
         """Main monitoring loop running in a separate thread"""
         if not self.serial_conn:
@@ -108,20 +163,33 @@ class ESP32Monitor:
         
         # Clear any initial data
         self.serial_conn.reset_input_buffer()
+        selector = self._make_selector()
         
         while not self.stop_event.is_set():
             try:
-                if self.serial_conn.in_waiting:
-                    line = self.serial_conn.readline().decode('utf-8').strip()
-                    if line:
-                        self._process_data(line)
+                # Sleep in the kernel until the port is readable, re-checking stop_event periodically
+                if selector and not selector.select(timeout=0.5):
+                    continue
+                
+                line = self.serial_conn.readline()
+                # Never read past the newline: a short line starting with the sync byte is
+                # usually boot noise, and reading on would swallow the next text line
+                if not self._is_accel_frame(line):
+                    line = line.strip()
+                if line:
+                    self._process_data(line)
             except serial.SerialException as e:
                 logger.error(f"Serial error: {e}")
                 # Try to reconnect
                 self.is_connected = False
                 time.sleep(5)
                 self.connect()
+                # The reconnected port has a new file descriptor
+                if selector:
+                    selector.close()
+                selector = self._make_selector()
             except Exception as e:
                 logger.error(f"Error in monitor loop: {e}")
-            
-            time.sleep(0.01)  # Small delay to prevent CPU hogging
+        
+        if selector:
+            selector.close()
@@ -1,22 +1,39 @@
 # main.py
-import time
 import logging
+import logging.handlers
+import queue
+import atexit
 import signal
 import sys
 import os
+from threading import Event
 from esp32_serial import ESP32Monitor
 from media_controller import MediaController
 from api_service import BrightnessAPI
 
 # Configure logging
+# Threads only enqueue records; a background listener does the formatting and file/console I/O
+log_queue = queue.SimpleQueue()  # reentrant, so logging from a signal handler cannot deadlock
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_handlers = [
+    logging.FileHandler("motion_media_controller.log"),
+    logging.StreamHandler()
+]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers)
+# Replace the handlers installed by the component modules at import time.
+# The queue handler only merges the message arguments; the listener's handlers apply the layout.
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("motion_media_controller.log"),
-        logging.StreamHandler()
-    ]
+    format='%(message)s',
+    handlers=[logging.handlers.QueueHandler(log_queue)],
+    force=True
 )
+log_listener.start()
+atexit.register(log_listener.stop)
+
 logger = logging.getLogger('Main')
 
 # Configuration
@@ -26,13 +43,14 @@ VIDEO_PATH = '/path/to/your/video.mp4'  # Replace with your video path
 IMAGE_PATH = '/path/to/your/image.jpg'  # Replace with your image path
 API_URL = 'https://backendlv8-production.up.railway.app/api/brightness/update'
 DEVICE_ID = 'AUTO_DEVICE_001'
+API_HEARTBEAT_INTERVAL = 300  # seconds; state changes are reported immediately
 
 class MotionMediaController:
     def __init__(self):
         self.esp32 = ESP32Monitor(port=ESP32_PORT, baudrate=ESP32_BAUDRATE)
         self.media = MediaController(VIDEO_PATH, IMAGE_PATH)
         self.api = BrightnessAPI(API_URL, DEVICE_ID)
-        self.running = False
+        self.stop_event = Event()
     
     def motion_handler(self, motion_detected):
         """Handle motion state changes"""
@@ -44,6 +62,9 @@ class MotionMediaController:
         else:
             # No motion: Play video, close image
             self.media.play_video()
+        
+        # Report the new brightness state right away instead of waiting for a poll
+        self.api.notify(self.get_current_brightness_state())
     
     def get_current_brightness_state(self):
         """Return current brightness state for API updates"""
@@ -53,7 +74,6 @@ class MotionMediaController:
     def start(self):
         """Start the application"""
         logger.info("Starting Motion Media Controller")
-        self.running = True
         
         # Register motion callback
         self.esp32.register_motion_callback(self.motion_handler)
@@ -65,9 +85,10 @@ class MotionMediaController:
         
         # Start with video by default (no motion)
         self.media.play_video()
+        self.api.notify(self.get_current_brightness_state())
         
-        # Start periodic API updates
-        self.api.start_periodic_updates(self.get_current_brightness_state, interval=10)
+        # Start the low-frequency API heartbeat
+        self.api.start_periodic_updates(self.get_current_brightness_state, interval=API_HEARTBEAT_INTERVAL)
         
         logger.info("Motion Media Controller started successfully")
         return True
@@ -75,7 +96,7 @@ class MotionMediaController:
     def stop(self):
         """Stop the application and clean up resources"""
         logger.info("Stopping Motion Media Controller")
-        self.running = False
+        self.stop_event.set()
         
         # Stop API updates
         self.api.stop_periodic_updates()
@@ -83,6 +104,9 @@ class MotionMediaController:
         # Disconnect from ESP32
         self.esp32.disconnect()
         
+        # No more motion events can arrive, so the API worker can be shut down
+        self.api.close()
+        
         # Clean up media resources
         self.media.cleanup()
         
@@ -91,8 +115,8 @@ class MotionMediaController:
     def run_forever(self):
         """Run the application until interrupted"""
         try:
-            while self.running:
-                time.sleep(1)
+            # Block until a shutdown is requested; no periodic wakeups
+            self.stop_event.wait()
         except KeyboardInterrupt:
             logger.info("Keyboard interrupt received")
         finally:
@@ -101,9 +125,11 @@ class MotionMediaController:
 # Signal handler for graceful shutdown
 def signal_handler(sig, frame):
     logger.info(f"Received signal {sig}, shutting down...")
+    # Wake run_forever, which performs the cleanup
     if 'controller' in globals():
-        controller.stop()
-    sys.exit(0)
+        controller.stop_event.set()
+    else:
+        sys.exit(0)
 
 if __name__ == "__main__":
     # Register signal handlers
@@ -115,4 +141,6 @@ if __name__ == "__main__":
     if controller.start():
         controller.run_forever()
     else:
+        # The media player is already running; don't leave it orphaned
+        controller.stop()
         sys.exit(1)
@@ -1,7 +1,9 @@
-# media_controller.py (updated for VLC)
+# media_controller.py (updated for a persistent mpv player)
 import subprocess
 import os
 import signal
+import socket
+import json
 import logging
 from threading import Lock
 import time
@@ -9,92 +11,142 @@ import time
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('Media_Controller')
 
+MPV_SOCKET_PATH = '/tmp/mpv.sock'
+MPV_STARTUP_TIMEOUT = 5  # seconds to wait for mpv to create its IPC socket
+
 class MediaController:
-    def __init__(self, video_path, image_path):
+    def __init__(self, video_path, image_path, socket_path=MPV_SOCKET_PATH):
         self.video_path = video_path
         self.image_path = image_path
-        self.video_process = None
-        self.image_process = None
+        self.socket_path = socket_path
+        self.player_process = None
+        self.sock = None
         self.lock = Lock()
         self.is_video_playing = False
         self.is_image_displayed = False
         
+        # Launch the player once; switching media is then a single IPC write
+        self._start_player()
+    
+    def _start_player(self):
+        """Launch mpv in idle mode and connect to its IPC socket"""
+        try:
+            self.player_process = subprocess.Popen([
+                'mpv', '--idle=yes', '--fullscreen', '--no-terminal', '--no-osc',
+                '--osd-level=0', '--hwdec=auto', '--loop-file=inf',
+                '--image-display-duration=inf',
+                f'--input-ipc-server={self.socket_path}'
+            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+               preexec_fn=os.setsid)
+        except Exception as e:
+            logger.error(f"Failed to start mpv: {e}")
+            return False
+        
+        # mpv creates the socket shortly after startup
+        deadline = time.monotonic() + MPV_STARTUP_TIMEOUT
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.socket_path)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                sock.close()
+                if self.player_process.poll() is not None or time.monotonic() > deadline:
+                    logger.error("mpv IPC socket did not become available")
+                    self._stop_player()
+                    return False
+                time.sleep(0.05)
+        
+        self.sock = sock
+        # Only command replies are wanted; without this mpv streams every player event to us
+        try:
+            self.sock.sendall(b'{"command": ["disable_event", "all"]}\n')
+        except OSError as e:
+            logger.error(f"Lost connection to mpv: {e}")
+            self._stop_player()
+            return False
+        logger.info(f"Started mpv player (IPC: {self.socket_path})")
+        return True
+    
+    def _stop_player(self):
+        """Close the IPC socket and terminate mpv"""
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+        
+        if self.player_process:
+            try:
+                pgid = os.getpgid(self.player_process.pid)
+                os.killpg(pgid, signal.SIGTERM)
+                # Return as soon as mpv exits rather than sleeping a fixed time
+                try:
+                    self.player_process.wait(timeout=0.5)
+                except subprocess.TimeoutExpired:
+                    os.killpg(pgid, signal.SIGKILL)
+                    self.player_process.wait()
+            except Exception as e:
+                logger.error(f"Error stopping mpv: {e}")
+            self.player_process = None
+        
+        self.is_video_playing = False
+        self.is_image_displayed = False
+    
+    def _send_command(self, *command):
+        """Send a JSON IPC command to mpv, restarting the player and retrying once if it has gone away"""
+        for _ in range(2):
+            if self.sock is None and not self._start_player():
+                return False
+            
+            try:
+                # Discard pending replies so the socket buffer never fills up
+                try:
+                    while True:
+                        if not self.sock.recv(4096, socket.MSG_DONTWAIT):
+                            raise ConnectionResetError("mpv closed the IPC socket")
+                except BlockingIOError:
+                    pass
+                if self.player_process.poll() is not None:
+                    raise ConnectionResetError("mpv has exited")
+                
+                self.sock.sendall(json.dumps({"command": list(command)}).encode() + b"\n")
+                return True
+            except OSError as e:
+                logger.error(f"Lost connection to mpv: {e}")
+                self._stop_player()
+        return False
+    
     def play_video(self):
-        """Start video playback using VLC"""
+        """Switch the player to the looping video"""
         with self.lock:
-            # First ensure image is closed
-            self.close_image()
-            
             # Check if video is already playing
-            if self.is_video_playing and self.video_process:
+            if self.is_video_playing:
                 logger.info("Video already playing")
                 return
             
-            try:
-                # Use VLC for hardware accelerated playback on Raspberry Pi 5
-                self.video_process = subprocess.Popen([
-                    'cvlc', '--loop', '--fullscreen', '--no-osd',
-                    '--no-video-title-show', self.video_path
-                ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, 
-                   preexec_fn=os.setsid)
-                
+            if self._send_command("loadfile", self.video_path, "replace"):
                 self.is_video_playing = True
+                self.is_image_displayed = False
                 logger.info(f"Started video playback: {self.video_path}")
-            except Exception as e:
-                logger.error(f"Failed to play video: {e}")
+            else:
+                logger.error("Failed to play video")
     
     def display_image(self):
-        """Display image using feh"""
+        """Switch the player to the still image"""
         with self.lock:
-            # First ensure video is closed
-            self.close_video()
-            
             # Check if image is already displayed
-            if self.is_image_displayed and self.image_process:
+            if self.is_image_displayed:
                 logger.info("Image already displayed")
                 return
             
-            try:
-                # Use feh for simple image display
-                self.image_process = subprocess.Popen(
-                    ['feh', '--fullscreen', '--hide-pointer', self.image_path],
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    preexec_fn=os.setsid
-                )
+            if self._send_command("loadfile", self.image_path, "replace"):
                 self.is_image_displayed = True
-                logger.info(f"Displayed image: {self.image_path}")
-            except Exception as e:
-                logger.error(f"Failed to display image: {e}")
-    
-    def close_video(self):
-        """Stop video playback"""
-        if self.is_video_playing and self.video_process:
-            try:
-                os.killpg(os.getpgid(self.video_process.pid), signal.SIGTERM)
-                self.video_process = None
                 self.is_video_playing = False
-                logger.info("Stopped video playback")
-                # Give system time to release resources
-                time.sleep(0.5)
-            except Exception as e:
-                logger.error(f"Error stopping video: {e}")
-    
-    def close_image(self):
-        """Close displayed image"""
-        if self.is_image_displayed and self.image_process:
-            try:
-                os.killpg(os.getpgid(self.image_process.pid), signal.SIGTERM)
-                self.image_process = None
-                self.is_image_displayed = False
-                logger.info("Closed image display")
-                # Give system time to release resources
-                time.sleep(0.5)
-            except Exception as e:
-                logger.error(f"Error closing image: {e}")
+                logger.info(f"Displayed image: {self.image_path}")
+            else:
+                logger.error("Failed to display image")
     
     def cleanup(self):
         """Clean up all resources"""
-        self.close_video()
-        self.close_image()
+        with self.lock:
+            self._stop_player()
         logger.info("Media controller cleaned up")
@@ -6,24 +6,34 @@ This script monitors an ESP32 sensor for motion detection via serial connection,
 switches between displaying an image (when motion is detected) and playing a video (when no motion),
 and reports the video playback state to a remote API.
 
+Both media files are loaded into one long-running VLC instance, which is switched between them
+over VLC's rc control socket instead of relaunching a player on every transition.
+
 Dependencies:
     - pyserial
     - requests
-    - VLC (cvlc command-line tool)
-    - feh (image viewer)
+    - orjson
+    - VLC (cvlc command-line tool with the rc interface)
 """
 
-import json
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import signal
+import socket
 import subprocess
 import sys
 import time
-from threading import Event, Lock, Thread
+from enum import Enum
+from threading import Event, Lock, Thread, Timer, current_thread
 
+import orjson
 import requests
 import serial
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ============================================================================
 # CONFIGURATION
@@ -33,36 +43,62 @@ import serial
 VIDEO_PATH = "I:\projector-startup\video.mp4"  # REPLACE with your video path
 IMAGE_PATH = "I:\projector-startup\image.jpg"  # REPLACE with your image path
 
+# Media player control
+VLC_RC_SOCKET = "/tmp/vlc.sock"
+PLAYER_STARTUP_TIMEOUT = 5  # seconds to wait for VLC to open its control socket
+
 # ESP32 configuration
 ESP32_PORT = "/dev/ttyUSB0"
 ESP32_BAUDRATE = 115200
+MAX_LINE_LENGTH = 4096  # bytes; longer unterminated input is discarded
 
 # API configuration
 API_ENDPOINT = "https://backendlv8-production.up.railway.app/api/brightness/update"
 DEVICE_ID = "AUTO_DEVICE_001"
 API_UPDATE_INTERVAL = 10  # seconds
+API_HEARTBEAT_INTERVAL = 300  # seconds between re-sends of an unchanged state
 
 # Motion detection parameters
 MOTION_TIMEOUT = 3  # seconds to wait before acting on motion
 
+# Logging
+LOG_LEVEL = logging.INFO  # use logging.WARNING for release deployments
+
 # ============================================================================
 # LOGGING SETUP
 # ============================================================================
 
+# Threads only enqueue records; a background listener formats them and writes to the
+# console and the (rotated) log file, so SD card writes never stall the serial thread
+log_queue = queue.SimpleQueue()  # reentrant, so logging from a signal handler cannot deadlock
+log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+log_handlers = [
+    logging.StreamHandler(),
+    logging.handlers.RotatingFileHandler("motion_controller.log", maxBytes=1_000_000, backupCount=3)
+]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers)
+# The queue handler only merges the message arguments; the listener's handlers apply the layout
 logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler("motion_controller.log")
-    ]
+    level=LOG_LEVEL,
+    format='%(message)s',
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
+log_listener.start()
+atexit.register(log_listener.stop)
+
 logger = logging.getLogger(__name__)
 
 # ============================================================================
 # ESP32 SERIAL MONITOR
 # ============================================================================
 
+# Plain-text status lines printed by the ESP32 firmware
+MOTION_DETECTED_MSG = b"Motion detected!"
+MOTION_STOPPED_MSG = b"Motion stopped"
+
 class ESP32Monitor:
     """Handles serial communication with ESP32 for motion detection."""
     
@@ -82,7 +118,7 @@ class ESP32Monitor:
             self.serial_conn = serial.Serial(
                 port=self.port,
                 baudrate=self.baudrate,
-                timeout=1
+                timeout=0.2  # readline() blocks at most this long, keeping shutdown responsive
             )
             self.is_connected = True
             logger.info("ESP32 connection successful")
@@ -120,24 +156,30 @@ class ESP32Monitor:
         return True
     
     def _process_data(self, data):
-        """Process incoming data from ESP32."""
-        try:
-            # Try to parse as JSON
-            parsed_data = json.loads(data)
-            
-            # Check for motion detection message
-            if 'motion' in parsed_data:
-                if self.motion_callback:
-                    self.motion_callback(parsed_data['motion'])
-                return parsed_data
-        except json.JSONDecodeError:
-            # Not JSON, look for text indicators
-            if "Motion detected!" in data:
-                if self.motion_callback:
-                    self.motion_callback(True)
-            elif "Motion stopped" in data:
-                if self.motion_callback:
-                    self.motion_callback(False)
+        """Process a raw line (bytes) from ESP32."""
+        callback = self.motion_callback
+        
+        # Only lines that look like a JSON object are worth handing to the parser
+        if data[:1] == b'{':
+            try:
+                parsed_data = orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+            else:
+                # Check for motion detection message
+                if 'motion' in parsed_data:
+                    if callback is not None:
+                        callback(parsed_data['motion'])
+                    return parsed_data
+                return data
+        
+        # Not JSON, look for text indicators
+        if callback is None:
+            return data
+        if MOTION_DETECTED_MSG in data:
+            callback(True)
+        elif MOTION_STOPPED_MSG in data:
+            callback(False)
         
         return data
     
@@ -149,43 +191,66 @@ class ESP32Monitor:
         
         # Clear any initial data
         self.serial_conn.reset_input_buffer()
+        buffer = bytearray()
         
         while not self.stop_event.is_set():
             try:
-                if self.serial_conn.in_waiting:
-                    line = self.serial_conn.readline().decode('utf-8').strip()
+                # readline() costs a read() syscall per byte; instead block for the first byte
+                # (up to the read timeout) and take everything the driver already has in one call
+                chunk = self.serial_conn.read(self.serial_conn.in_waiting or 1)
+                if not chunk:
+                    continue
+                
+                buffer += chunk
+                *lines, buffer = buffer.split(b'\n')
+                for line in lines:
+                    line = bytes(line).strip()
                     if line:
-                        logger.debug(f"ESP32 data: {line}")
+                        # Deferred %-formatting: nothing is built unless DEBUG is enabled
+                        logger.debug("ESP32 data: %s", line)
                         self._process_data(line)
+                
+                # Never let a stream without newlines grow the buffer unbounded
+                if len(buffer) > MAX_LINE_LENGTH:
+                    logger.warning(f"Discarding {len(buffer)} bytes of ESP32 data without a line break")
+                    buffer.clear()
             except serial.SerialException as e:
                 logger.error(f"Serial error: {e}")
                 # Try to reconnect
                 self.is_connected = False
+                buffer.clear()
                 time.sleep(5)
                 self.connect()
             except Exception as e:
                 logger.error(f"Error in monitor loop: {e}")
-            
-            time.sleep(0.01)  # Small delay to prevent CPU hogging
 
 # ============================================================================
 # MEDIA CONTROLLER
 # ============================================================================
 
+class MediaState(Enum):
+    """What the media player is currently showing."""
+    NONE = "none"
+    VIDEO = "video"
+    IMAGE = "image"
+
 class MediaController:
-    """Controls video playback and image display."""
+    """Controls video playback and image display through a single long-running VLC instance."""
     
     def __init__(self, video_path, image_path):
         self.video_path = video_path
         self.image_path = image_path
-        self.video_process = None
-        self.image_process = None
-        self.lock = Lock()
-        self.is_video_playing = False
-        self.is_image_displayed = False
+        self.player_process = None
+        self.player_pgid = None
+        self.player_sock = None
+        self.lock = Lock()  # serializes player switches; state reads never take it
+        self.state = MediaState.NONE
         
         # Validate media files
         self._validate_files()
+        
+        # Launch the player once; switching media is then a single socket write
+        self._start_player()
     
     def _validate_files(self):
         """Validate that the media files exist."""
@@ -199,91 +264,143 @@ class MediaController:
         
         logger.info(f"Media files validated - Video: {self.video_path}, Image: {self.image_path}")
     
-    def play_video(self):
-        """Start video playback using VLC."""
-        with self.lock:
-            # First ensure image is closed
-            self.close_image()
-            
-            # Check if video is already playing
-            if self.is_video_playing and self.video_process:
-                logger.debug("Video already playing")
-                return
+    @property
+    def is_video_playing(self):
+        """Whether the video is currently shown."""
+        return self.state is MediaState.VIDEO
+    
+    @property
+    def is_image_displayed(self):
+        """Whether the image is currently shown."""
+        return self.state is MediaState.IMAGE
+    
+    def _start_player(self):
+        """Launch VLC once with both media files and connect to its rc control socket."""
+        try:
+            command = [
+                'cvlc', '--extraintf', 'rc', '--rc-unix', VLC_RC_SOCKET,
+                '--no-playlist-autostart', '--repeat', '--image-duration=-1',
+                '--fullscreen', '--no-osd', '--no-video-title-show',
+                self.video_path, self.image_path
+            ]
             
+            self.player_process = subprocess.Popen(
+                command,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                preexec_fn=os.setsid
+            )
+            self.player_pgid = os.getpgid(self.player_process.pid)
+        except Exception as e:
+            logger.error(f"Failed to start VLC: {e}")
+            return False
+        
+        # VLC creates the control socket shortly after startup
+        deadline = time.monotonic() + PLAYER_STARTUP_TIMEOUT
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
             try:
-                # Use VLC for playback
-                command = [
-                    'cvlc', '--loop', '--fullscreen', '--no-osd',
-                    '--no-video-title-show', self.video_path
-                ]
-                
-                self.video_process = subprocess.Popen(
-                    command,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    preexec_fn=os.setsid
-                )
-                
-                self.is_video_playing = True
-                logger.info(f"Started video playback: {self.video_path}")
+                sock.connect(VLC_RC_SOCKET)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                sock.close()
+                if self.player_process.poll() is not None or time.monotonic() > deadline:
+                    logger.error("VLC control socket did not become available")
+                    self._stop_player()
+                    return False
+                time.sleep(0.05)
+        
+        self.player_sock = sock
+        logger.info(f"Started VLC player (control socket: {VLC_RC_SOCKET})")
+        return True
+    
+    def _stop_player(self):
+        """Close the control socket and terminate VLC."""
+        if self.player_sock:
+            self.player_sock.close()
+            self.player_sock = None
+        
+        if self.player_process:
+            try:
+                self._terminate_process(self.player_process, self.player_pgid)
             except Exception as e:
-                logger.error(f"Failed to play video: {e}")
+                logger.error(f"Error stopping VLC: {e}")
+            self.player_process = None
+        
+        self.state = MediaState.NONE
     
-    def display_image(self):
-        """Display image using feh."""
-        with self.lock:
-            # First ensure video is closed
-            self.close_video()
-            
-            # Check if image is already displayed
-            if self.is_image_displayed and self.image_process:
-                logger.debug("Image already displayed")
-                return
+    def _send_command(self, command):
+        """Send an rc command to VLC, restarting the player and retrying once if it has gone away."""
+        for _ in range(2):
+            if self.player_sock is None and not self._start_player():
+                return False
             
             try:
-                # Use feh for image display
-                command = ['feh', '--fullscreen', '--hide-pointer', self.image_path]
-                
-                self.image_process = subprocess.Popen(
-                    command,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    preexec_fn=os.setsid
-                )
+                # Discard pending replies and prompts so the socket buffer never fills up
+                try:
+                    while True:
+                        if not self.player_sock.recv(4096, socket.MSG_DONTWAIT):
+                            raise ConnectionResetError("VLC closed the control socket")
+                except BlockingIOError:
+                    pass
+                if self.player_process.poll() is not None:
+                    raise ConnectionResetError("VLC has exited")
                 
-                self.is_image_displayed = True
-                logger.info(f"Displayed image: {self.image_path}")
-            except Exception as e:
-                logger.error(f"Failed to display image: {e}")
+                self.player_sock.sendall(command + b"\n")
+                return True
+            except OSError as e:
+                logger.error(f"Lost connection to VLC: {e}")
+                self._stop_player()
+        return False
     
-    def close_video(self):
-        """Stop video playback."""
-        if self.is_video_playing and self.video_process:
-            try:
-                os.killpg(os.getpgid(self.video_process.pid), signal.SIGTERM)
-                self.video_process = None
-                self.is_video_playing = False
-                logger.info("Stopped video playback")
-                time.sleep(0.5)  # Give system time to release resources
-            except Exception as e:
-                logger.error(f"Error stopping video: {e}")
+    def _terminate_process(self, process, pgid):
+        """Terminate a player's process group and wait only until it has actually exited."""
+        os.killpg(pgid, signal.SIGTERM)
+        try:
+            process.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            os.killpg(pgid, signal.SIGKILL)
+            process.wait()
     
-    def close_image(self):
-        """Close displayed image."""
-        if self.is_image_displayed and self.image_process:
-            try:
-                os.killpg(os.getpgid(self.image_process.pid), signal.SIGTERM)
-                self.image_process = None
-                self.is_image_displayed = False
-                logger.info("Closed image display")
-                time.sleep(0.5)  # Give system time to release resources
-            except Exception as e:
-                logger.error(f"Error closing image: {e}")
+    def _switch_to(self, target, command):
+        """Move the player to the target state, holding the lock only for the switch itself."""
+        with self.lock:
+            # Re-check under the lock in case another thread switched first
+            if self.state is target:
+                return True
+            if not self._send_command(command):
+                return False
+            self.state = target
+            return True
+    
+    def play_video(self):
+        """Switch the player to the looping video (playlist item 1)."""
+        # Cheap check without the lock; most calls find the player already in this state
+        if self.state is MediaState.VIDEO:
+            logger.debug("Video already playing")
+            return
+        
+        if self._switch_to(MediaState.VIDEO, b"goto 1"):
+            logger.info(f"Started video playback: {self.video_path}")
+        else:
+            logger.error("Failed to play video")
+    
+    def display_image(self):
+        """Switch the player to the still image (playlist item 2)."""
+        # Cheap check without the lock; most calls find the player already in this state
+        if self.state is MediaState.IMAGE:
+            logger.debug("Image already displayed")
+            return
+        
+        if self._switch_to(MediaState.IMAGE, b"goto 2"):
+            logger.info(f"Displayed image: {self.image_path}")
+        else:
+            logger.error("Failed to display image")
     
     def cleanup(self):
         """Clean up all resources."""
-        self.close_video()
-        self.close_image()
+        with self.lock:
+            self._stop_player()
         logger.info("Media controller cleaned up")
 
 # ============================================================================
@@ -298,20 +415,95 @@ class APIService:
         self.device_id = device_id
         self.full_url = f"{self.api_url}?deviceId={self.device_id}"
         self.last_reported_state = None
+        self.last_send_time = 0.0
         self.update_thread = None
         self.stop_event = Event()
+        
+        # The payload only ever has two values, so serialize both once up front
+        self.body_on = b'{"brightness":true}'
+        self.body_off = b'{"brightness":false}'
+        
+        # Keep one pooled keep-alive connection to the API instead of a new TLS handshake per update
+        self.session = requests.Session()
+        retries = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=frozenset(["POST"])  # brightness updates are idempotent
+        )
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=retries))
+        self.session.headers.update({"Content-Type": "application/json", "Connection": "keep-alive"})
+        
+        # All POSTs go through one sender thread so callers never wait on the network;
+        # items are (is_on, force) and only the sender compares against last_reported_state
+        self.send_queue = queue.Queue(maxsize=16)
+        self.sender_stop = Event()
+        self.sender_thread = Thread(target=self._sender_loop)
+        self.sender_thread.daemon = True
+        self.sender_thread.start()
+    
+    def close(self):
+        """Stop the sender thread and close the pooled API connection."""
+        self.sender_stop.set()
+        # Wake the sender; put directly so a concurrent post_state() drain can't lose it
+        try:
+            self.send_queue.put(None, timeout=1)
+        except queue.Full:
+            pass  # the sender is busy and will see sender_stop after its current item
+        self.sender_thread.join(timeout=2)
+        if self.sender_thread.is_alive():
+            logger.warning("API sender still busy; leaving its connection open until exit")
+            return
+        self.session.close()
+    
+    def _enqueue(self, is_on, force):
+        """Replace any pending updates with this one; only the newest state matters."""
+        try:
+            while True:
+                pending = self.send_queue.get_nowait()
+                # Keep a pending heartbeat's force flag so it isn't lost to coalescing
+                if pending is not None:
+                    force = force or pending[1]
+        except queue.Empty:
+            pass
+        
+        try:
+            self.send_queue.put_nowait((is_on, force))
+        except queue.Full:
+            logger.warning(f"API send queue full, dropping update: brightness={is_on}")
+    
+    def _sender_loop(self):
+        """Send queued brightness updates until close() sets sender_stop."""
+        while True:
+            item = self.send_queue.get()
+            if self.sender_stop.is_set():
+                break
+            if item is None:
+                continue
+            is_on, force = item
+            # last_reported_state is only written here, so it is current for this check
+            if force or is_on != self.last_reported_state:
+                self.update_brightness(is_on)
+    
+    def post_state(self, is_on, force=False):
+        """Queue a brightness update without blocking the caller; force sends it even if unchanged."""
+        if self.sender_stop.is_set():
+            return
+        self._enqueue(is_on, force)
     
     def update_brightness(self, is_on):
         """Update brightness state via API."""
         try:
-            payload = {"brightness": is_on}
+            body = self.body_on if is_on else self.body_off
             
             logger.info(f"Sending API update: brightness={is_on}")
-            response = requests.post(self.full_url, json=payload, timeout=5)
+            # Content-Type: application/json is set once on the session
+            response = self.session.post(self.full_url, data=body, timeout=5)
             
             if response.status_code == 200:
                 logger.info(f"API update successful: brightness={is_on}")
                 self.last_reported_state = is_on
+                self.last_send_time = time.monotonic()
                 return True
             else:
                 logger.error(f"API error: {response.status_code} - {response.text}")
@@ -320,6 +512,10 @@ class APIService:
             logger.error(f"API request failed: {e}")
             return False
     
+    def report_change(self, is_on):
+        """Queue a state change; the sender skips it if it matches the last state reported."""
+        self.post_state(is_on)
+    
     def start_periodic_updates(self, get_state_callback, interval=10):
         """Start periodic API updates based on the provided callback."""
         self.stop_event.clear()
@@ -344,17 +540,18 @@ class APIService:
             try:
                 current_state = get_state_callback()
                 
-                # Only update if state has changed or never reported
-                if self.last_reported_state is None or current_state != self.last_reported_state:
-                    self.update_brightness(current_state)
+                # Transitions are reported on edge by the controller; here we only retry a
+                # transition that failed to send, or send a heartbeat for an unchanged state
+                if time.monotonic() - self.last_send_time >= API_HEARTBEAT_INTERVAL:
+                    self.post_state(current_state, force=True)
+                elif current_state != self.last_reported_state:
+                    self.post_state(current_state)
             except Exception as e:
                 logger.error(f"Error in API update loop: {e}")
             
-            # Sleep in small increments to respond to stop event more quickly
-            for _ in range(interval * 10):
-                if self.stop_event.is_set():
-                    break
-                time.sleep(0.1)
+            # Sleep for the whole interval, waking immediately if stop is requested
+            if self.stop_event.wait(timeout=interval):
+                break
 
 # ============================================================================
 # MAIN CONTROLLER
@@ -370,9 +567,10 @@ class MotionMediaController:
         self.api = APIService(API_ENDPOINT, DEVICE_ID)
         
         # State tracking
-        self.running = False
+        self.stop_event = Event()
         self.motion_detected = False
-        self.motion_start_time = 0
+        self.motion_timer = None
+        self.timer_lock = Lock()
     
     def motion_handler(self, motion_detected):
         """Handle motion state changes from ESP32."""
@@ -381,26 +579,36 @@ class MotionMediaController:
             self.motion_detected = motion_detected
             
             if motion_detected:
-                # Record when motion started
-                self.motion_start_time = time.time()
-                # Schedule transition after timeout
-                Thread(target=self._handle_motion_after_timeout).start()
+                # (Re)arm the single pending timer instead of spawning a waiter thread per event
+                with self.timer_lock:
+                    self._cancel_motion_timer()
+                    self.motion_timer = Timer(MOTION_TIMEOUT, self._handle_motion_after_timeout)
+                    self.motion_timer.daemon = True
+                    self.motion_timer.start()
             else:
-                # No motion, switch to video immediately
-                self.media.play_video()
+                # No motion, drop any pending image switch and go to video immediately;
+                # holding timer_lock keeps a firing timer from switching back to the image
+                with self.timer_lock:
+                    self._cancel_motion_timer()
+                    self.media.play_video()
+                self.api.report_change(self.get_brightness_state())
+    
+    def _cancel_motion_timer(self):
+        """Cancel the pending sustained-motion timer, if any (caller holds timer_lock)."""
+        if self.motion_timer:
+            self.motion_timer.cancel()
+            self.motion_timer = None
     
     def _handle_motion_after_timeout(self):
-        """Handle motion detection after the specified timeout."""
-        # Store the start time we're waiting for
-        start_time = self.motion_start_time
-        
-        # Wait for the timeout
-        time.sleep(MOTION_TIMEOUT)
-        
-        # Only proceed if motion is still detected and it's the same event
-        if self.motion_detected and start_time == self.motion_start_time:
+        """Handle motion that has been sustained for the full timeout."""
+        with self.timer_lock:
+            # Motion may have stopped, or the timer been re-armed, just as this one fired
+            if current_thread() is not self.motion_timer or not self.motion_detected:
+                return
+            self.motion_timer = None
             logger.info(f"Motion sustained for {MOTION_TIMEOUT}s - displaying image")
             self.media.display_image()
+        self.api.report_change(self.get_brightness_state())
     
     def get_brightness_state(self):
         """Return current brightness state for API updates."""
@@ -410,7 +618,6 @@ class MotionMediaController:
     def start(self):
         """Start the controller and all its components."""
         logger.info("Starting Motion Media Controller")
-        self.running = True
         
         # Register motion callback
         self.esp32.register_motion_callback(self.motion_handler)
@@ -432,7 +639,11 @@ class MotionMediaController:
     def stop(self):
         """Stop the controller and clean up resources."""
         logger.info("Stopping Motion Media Controller")
-        self.running = False
+        self.stop_event.set()
+        
+        # Cancel any pending image switch
+        with self.timer_lock:
+            self._cancel_motion_timer()
         
         # Stop API updates
         self.api.stop_periodic_updates()
@@ -440,6 +651,9 @@ class MotionMediaController:
         # Disconnect from ESP32
         self.esp32.disconnect()
         
+        # No more motion events can arrive, so the API sender can be shut down
+        self.api.close()
+        
         # Clean up media resources
         self.media.cleanup()
         
@@ -449,8 +663,8 @@ class MotionMediaController:
         """Run the controller until interrupted."""
         try:
             logger.info("Controller running - press Ctrl+C to stop")
-            while self.running:
-                time.sleep(1)
+            # Block until a shutdown is requested; no periodic wakeups
+            self.stop_event.wait()
         except KeyboardInterrupt:
             logger.info("Keyboard interrupt received")
         finally:
@@ -463,9 +677,11 @@ class MotionMediaController:
 def signal_handler(sig, frame):
     """Handle system signals for clean shutdown."""
     logger.info(f"Received signal {sig}, shutting down...")
+    # Wake run_forever, which performs the cleanup
     if 'controller' in globals():
-        controller.stop()
-    sys.exit(0)
+        controller.stop_event.set()
+    else:
+        sys.exit(0)
 
 def main():
     """Main entry point for the application."""
@@ -480,6 +696,8 @@ def main():
     if controller.start():
         controller.run_forever()
     else:
+        # VLC is already running in its own process group; don't leave it orphaned
+        controller.stop()
         sys.exit(1)
 
 if __name__ == "__main__":
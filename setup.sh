@@ -6,7 +6,7 @@ echo "Setting up Motion Media Controller..."
 # Install system dependencies
 echo "Installing system dependencies..."
 sudo apt-get update
-sudo apt-get install -y python3-pip vlc feh
+sudo apt-get install -y python3-pip vlc mpv
 
 # Install Python dependencies
 echo "Installing Python dependencies..."